@@ -0,0 +1,74 @@
+# assets.py - Arquivos estáticos com hash no nome, gzip pré-calculado e cache imutável
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, abort, request
+
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+class _Asset:
+    def __init__(self, data, mimetype, digest):
+        self.data = data
+        self.mimetype = mimetype
+        self.etag = digest
+        compressible = mimetype.startswith(COMPRESSIBLE_TYPES)
+        self.gzipped = gzip.compress(data, compresslevel=9, mtime=0) if compressible else None
+
+
+class AssetManifest:
+    """Mapeia 'app.js' -> 'app.<hash>.js' e serve o conteúdo a partir da memória.
+
+    Como a URL muda sempre que o conteúdo muda, o navegador pode guardar o
+    arquivo para sempre (immutable) e recarregar a página só busca o HTML.
+    """
+
+    def __init__(self, static_dir, files, url_prefix="/assets"):
+        self.static_dir = static_dir
+        self.files = files
+        self.url_prefix = url_prefix
+        self._urls = {}
+        self._assets = {}
+        self.build()
+
+    def build(self):
+        for name in self.files:
+            path = os.path.join(self.static_dir, name)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            base, ext = os.path.splitext(name)
+            fingerprinted = f"{base}.{digest}{ext}"
+            mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if mimetype.startswith("text/") or mimetype == "application/javascript":
+                mimetype += "; charset=utf-8"
+            self._assets[fingerprinted] = _Asset(data, mimetype, digest)
+            self._urls[name] = f"{self.url_prefix}/{fingerprinted}"
+
+    def url(self, name):
+        """URL com hash, ou None se o arquivo não existe"""
+        return self._urls.get(name)
+
+    def init_app(self, app):
+        app.add_url_rule(f"{self.url_prefix}/<path:filename>", "assets", self.serve)
+        app.jinja_env.globals["asset_url"] = self.url
+
+    def serve(self, filename):
+        asset = self._assets.get(filename)
+        if asset is None:
+            abort(404)
+
+        headers = {"Cache-Control": CACHE_CONTROL, "ETag": f'"{asset.etag}"', "Vary": "Accept-Encoding"}
+        if request.if_none_match.contains(asset.etag):
+            return Response(status=304, headers=headers)
+
+        body = asset.data
+        if asset.gzipped is not None and "gzip" in request.accept_encodings:
+            body = asset.gzipped
+            headers["Content-Encoding"] = "gzip"
+        return Response(body, content_type=asset.mimetype, headers=headers)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# bench_startup.py - Mede o cold start: tempo até o primeiro 200 em /health
+#
+# Uso:
+#   python bench_startup.py                      # python main_app.py, 5 execuções
+#   python bench_startup.py --runs 10
+#   python bench_startup.py --cmd "gunicorn --worker-class eventlet -w 1 -b 0.0.0.0:5001 main_app:app"
+#   python bench_startup.py --import-only        # só o tempo de "import main_app"
+
+import argparse
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+DEFAULT_URL = "http://127.0.0.1:5001/health"
+
+
+def wait_for_health(process, url, timeout):
+    """Retorna o tempo até o primeiro 200; falha se o processo morrer"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"Processo terminou com código {process.returncode}")
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"Sem resposta 200 em {url} após {timeout}s")
+
+
+def measure_health(cmd, url, timeout):
+    started = time.perf_counter()
+    process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_health(process, url, timeout)
+        return time.perf_counter() - started
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def measure_import():
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main_app"], check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cold start do dashboard")
+    parser.add_argument("--cmd", default=f"{sys.executable} main_app.py",
+                        help="comando que sobe o servidor")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--import-only", action="store_true",
+                        help="mede só o import de main_app (sem subir o servidor)")
+    args = parser.parse_args()
+
+    label = "import main_app" if args.import_only else f"primeiro 200 em {args.url}"
+    print(f"⏱️ Medindo {label} ({args.runs} execuções)")
+
+    samples = []
+    for run in range(1, args.runs + 1):
+        if args.import_only:
+            elapsed = measure_import()
+        else:
+            elapsed = measure_health(shlex.split(args.cmd), args.url, args.timeout)
+        samples.append(elapsed)
+        print(f"  #{run}: {elapsed * 1000:.0f} ms")
+
+    print(f"📊 min {min(samples) * 1000:.0f} ms | "
+          f"mediana {statistics.median(samples) * 1000:.0f} ms | "
+          f"máx {max(samples) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,21 @@ from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 from config import (BASE_URL, JOGO_SLUG, TARGET_SECTOR_SLUG,
                     MAX_WATCH_ATTEMPTS, WATCH_INTERVAL_MIN, WATCH_INTERVAL_MAX,
-                    HEADERS, DEBUG_HTML_FILE, SETORES_URL, CATEGORIA_URL)
+                    HEADERS, DEBUG_HTML_FILE, SETORES_URL, CATEGORIA_URL,
+                    STRUCTURED_LOG_ENABLED, STRUCTURED_LOG_FILE)
 from session_manager import get_authenticated_session
+from structured_logging import create_structured_handler, set_phase
 
 # Configuração do logging para este processo
+log_handlers = [logging.FileHandler("log_reserva_final.txt", encoding="utf-8"),
+                logging.StreamHandler()]
+if STRUCTURED_LOG_ENABLED:
+    log_handlers.append(create_structured_handler(STRUCTURED_LOG_FILE))
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s | %(levelname)s | %(message)s",
-    handlers=[logging.FileHandler("log_reserva_final.txt", encoding="utf-8"),
-              logging.StreamHandler()],
+    handlers=log_handlers,
 )
 log = logging.getLogger("bot-worker")
 
@@ -309,6 +315,7 @@ def attempt_sector_attack(client: httpx.Client, soup: BeautifulSoup) -> bool:
     Tenta atacar o setor alvo com estratégias múltiplas e extração dinâmica de dependentes.
     Agora lida com fluxo de duas etapas (modo de compra + dependentes).
     """
+    set_phase("attack")
     log.info("⚡ Iniciando sequência de ataque...")
     
     # Estratégia 1: URL padrão (formato SVG)
@@ -456,6 +463,7 @@ def watch_and_attack(session_cookies: dict) -> bool:
     """
     Vigilância otimizada do setor alvo com suporte a múltiplos formatos.
     """
+    set_phase("watch")
     log.info("▶️ FASE 2: Iniciando Vigilância Otimizada do Setor")
     log.info(f"🎯 Alvo: {TARGET_SECTOR_SLUG.upper()}")
 
@@ -495,6 +503,7 @@ def watch_and_attack(session_cookies: dict) -> bool:
                     if attack_success:
                         return True
                     else:
+                        set_phase("watch")
                         log.error("❌ ATAQUE FALHOU! Oportunidade não convertida.")
                         log.warning("🔄 Continuando vigilância...")
                 
@@ -536,6 +545,7 @@ def main():
     
     while attempt_count < max_login_attempts:
         attempt_count += 1
+        set_phase("login")
         log.info(f"🔑 Tentativa de autenticação #{attempt_count}/{max_login_attempts}")
         
         # Obtém sessão autenticada
@@ -549,6 +559,7 @@ def main():
             mission_completed = watch_and_attack(cookies)
             
             if mission_completed:
+                set_phase("done")
                 log.info("🏁 MISSÃO CONCLUÍDA COM SUCESSO! Encerrando worker.")
                 break
             else:
@@ -60,6 +60,17 @@ HEADERS = {
 
 # Arquivos de trabalho
 LOG_FILE = Path("log_reserva_final.txt")
+STRUCTURED_LOG_FILE = Path("log_reserva_final.jsonl")
 AUDIO_FILE = Path("audio_captcha.mp3")
 DEBUG_HTML_FILE = Path("debug_setores.html")
 SCREENSHOT_ERROR_FILE = Path("fatal_error_screenshot.png")
+
+# --- Rotação de Logs ---
+LOG_ARCHIVE_DIR = Path(os.getenv("LOG_ARCHIVE_DIR", "logs"))
+LOG_ROTATE_MAX_MB = float(os.getenv("LOG_ROTATE_MAX_MB", "5"))
+LOG_ROTATE_MAX_HOURS = float(os.getenv("LOG_ROTATE_MAX_HOURS", "24"))
+LOG_RETENTION_MAX_MB = float(os.getenv("LOG_RETENTION_MAX_MB", "100"))
+LOG_RETENTION_MAX_SEGMENTS = int(os.getenv("LOG_RETENTION_MAX_SEGMENTS", "200"))
+
+# --- Log Estruturado (JSON lines, opcional) ---
+STRUCTURED_LOG_ENABLED = os.getenv("STRUCTURED_LOG", "false").lower() in ("1", "true", "yes")
@@ -0,0 +1,138 @@
+# config_store.py - Leitura em cache e escrita atômica do arquivo .env
+import os
+import re
+import tempfile
+from threading import Lock
+
+from dotenv import dotenv_values
+
+KEY_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+INT_KEYS = {"MAX_WATCH_ATTEMPTS", "CAPTCHA_SOLVE_TIMEOUT", "CATEGORIA_ID"}
+FLOAT_KEYS = {"WATCH_INTERVAL_MIN", "WATCH_INTERVAL_MAX"}
+
+
+class ConfigValidationError(ValueError):
+    """Erros de validação por chave: {"CHAVE": "mensagem"}"""
+
+    def __init__(self, errors):
+        super().__init__("Configuração inválida")
+        self.errors = errors
+
+
+def validate_config(data):
+    """Valida e normaliza os valores enviados pelo dashboard
+
+    Valores vazios são ignorados (mantém o valor atual), como antes.
+    """
+    if not isinstance(data, dict):
+        raise ConfigValidationError({"_": "Esperado um objeto JSON"})
+
+    errors = {}
+    updates = {}
+    for key, value in data.items():
+        if value is None or value == "":
+            continue
+        if not isinstance(key, str) or not KEY_PATTERN.match(key):
+            errors[str(key)] = "Nome de variável inválido"
+            continue
+        key = key.upper()
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            errors[key] = "Valor deve ser texto ou número"
+            continue
+        value = str(value).strip()
+        if "\n" in value or "\r" in value:
+            errors[key] = "Valor não pode conter quebra de linha"
+            continue
+        if key in INT_KEYS:
+            try:
+                if int(value) <= 0:
+                    raise ValueError
+            except ValueError:
+                errors[key] = "Deve ser um inteiro positivo"
+                continue
+        if key in FLOAT_KEYS:
+            try:
+                if float(value) <= 0:
+                    raise ValueError
+            except ValueError:
+                errors[key] = "Deve ser um número positivo"
+                continue
+        updates[key] = value
+
+    if errors:
+        raise ConfigValidationError(errors)
+    return updates
+
+
+def _format_line(key, value):
+    # Aspas só quando necessário, para o dotenv não cortar em espaços ou '#'
+    if value and re.search(r'[\s#"\'\\]', value):
+        value = '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return f"{key}={value}\n"
+
+
+class EnvConfigStore:
+    """Cache do .env que só relê o arquivo quando mtime/tamanho mudam.
+
+    Escritas são feitas sob lock em um arquivo temporário no mesmo diretório
+    e publicadas com os.replace, então leitores nunca veem um arquivo pela
+    metade e saves concorrentes não se sobrescrevem.
+    """
+
+    def __init__(self, path=".env"):
+        self.path = str(path)
+        self._values = {}
+        self._signature = None
+        self._lock = Lock()
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _reload_if_changed(self):
+        signature = self._stat_signature()
+        if signature != self._signature:
+            self._values = dict(dotenv_values(self.path) or {}) if signature else {}
+            self._signature = signature
+
+    def get(self):
+        """Cópia dos valores atuais"""
+        with self._lock:
+            self._reload_if_changed()
+            return dict(self._values)
+
+    def update(self, data):
+        """Valida, mescla e grava; retorna as chaves alteradas"""
+        updates = validate_config(data)
+        with self._lock:
+            self._reload_if_changed()
+            values = dict(self._values)
+            values.update(updates)
+            self._write(values)
+            self._values = values
+            self._signature = self._stat_signature()
+        return sorted(updates)
+
+    def _write(self, values):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".env.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for key, value in values.items():
+                    f.write(_format_line(key, value if value is not None else ""))
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(tmp_path, os.stat(self.path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
@@ -0,0 +1,153 @@
+# log_broadcast.py - Envio agrupado de linhas de log com fila limitada por cliente
+import logging
+import time
+from collections import deque
+from threading import Event, Lock, Thread
+
+log = logging.getLogger("log-broadcast")
+
+FRAME_INTERVAL = 0.075     # Janela de agrupamento das linhas (segundos)
+CLIENT_QUEUE_MAX = 2000    # Linhas pendentes por cliente antes de descartar as mais antigas
+FRAME_LINES_MAX = 1000     # Linhas por frame
+ACK_TIMEOUT = 10.0         # Após esse tempo sem ack o cliente volta a receber frames
+
+
+class _ClientQueue:
+    def __init__(self, maxlen):
+        self.lines = deque(maxlen=maxlen)  # (offset_final, linha, bytes)
+        self.min_offset = 0
+        self.dropped = 0
+        self.inflight_since = None
+
+
+class LogBroadcaster:
+    """Agrupa linhas em frames e envia a cada cliente no ritmo que ele aguenta.
+
+    Cada cliente tem sua própria fila limitada; enquanto o frame anterior não
+    for confirmado (ack do socket.io) nada mais é enviado para ele, e se a fila
+    encher as linhas mais antigas são descartadas e contabilizadas em
+    `dropped`. Um navegador travado não atrasa os demais nem faz a memória
+    do servidor crescer.
+    """
+
+    def __init__(self, socketio, interval=FRAME_INTERVAL, queue_max=CLIENT_QUEUE_MAX):
+        self.socketio = socketio
+        self.interval = interval
+        self.queue_max = queue_max
+        self.clients = {}
+        self.bytes_sent = 0    # Bytes de log enviados em frames (soma de todos os clientes)
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread de envio (idempotente)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def register(self, sid):
+        with self._lock:
+            self.clients[sid] = _ClientQueue(self.queue_max)
+
+    def set_offset(self, sid, offset):
+        """Linhas que terminam até `offset` já foram enviadas por outro caminho"""
+        with self._lock:
+            client = self.clients.get(sid)
+            if client:
+                client.min_offset = offset
+                while client.lines and client.lines[0][0] <= offset:
+                    client.lines.popleft()
+
+    def unregister(self, sid):
+        with self._lock:
+            self.clients.pop(sid, None)
+
+    def publish(self, text, end_offset):
+        """Enfileira um bloco de linhas completas terminando em end_offset"""
+        raw_lines = text.encode('utf-8').splitlines(keepends=True)
+        offset = end_offset - sum(len(raw) for raw in raw_lines)
+        entries = []
+        for raw in raw_lines:
+            offset += len(raw)
+            entries.append((offset, raw.decode('utf-8', errors='replace'), len(raw)))
+
+        with self._lock:
+            for client in self.clients.values():
+                for entry in entries:
+                    if entry[0] <= client.min_offset:
+                        continue
+                    if len(client.lines) == client.lines.maxlen:
+                        client.dropped += 1
+                    client.lines.append(entry)
+        self._wakeup.set()
+
+    def reset(self):
+        """Arquivo truncado/rotacionado: o que estava pendente perdeu o sentido"""
+        with self._lock:
+            for client in self.clients.values():
+                client.lines.clear()
+                client.min_offset = 0
+                client.dropped = 0
+                # O ack do frame antigo pode se perder: não espera ACK_TIMEOUT
+                client.inflight_since = None
+
+    def ack(self, sid):
+        with self._lock:
+            client = self.clients.get(sid)
+            if client is None:
+                return
+            client.inflight_since = None
+            pending = bool(client.lines)
+        if pending:
+            self._wakeup.set()
+
+    def _run(self):
+        timeout = None
+        while True:
+            try:
+                # Sem linhas novas a thread fica parada (nenhum wakeup ocioso)
+                self._wakeup.wait(timeout)
+                # Espera a janela para juntar as linhas que chegarem em sequência
+                time.sleep(self.interval)
+                self._wakeup.clear()
+                timeout = self.flush()
+            except Exception as e:
+                log.error(f"❌ Erro no envio de logs: {e}")
+                time.sleep(1)
+
+    def flush(self):
+        """Envia um frame para cada cliente livre
+
+        Retorna em quantos segundos vence o ack mais antigo de um cliente com
+        linhas pendentes (None se não há nada esperando).
+        """
+        frames = []
+        next_timeout = None
+        now = time.time()
+        with self._lock:
+            for sid, client in self.clients.items():
+                if not client.lines:
+                    continue
+                if client.inflight_since and now - client.inflight_since < ACK_TIMEOUT:
+                    wait = ACK_TIMEOUT - (now - client.inflight_since)
+                    next_timeout = wait if next_timeout is None else min(next_timeout, wait)
+                    continue
+                count = min(len(client.lines), FRAME_LINES_MAX)
+                batch = [client.lines.popleft() for _ in range(count)]
+                self.bytes_sent += sum(size for _, _, size in batch)
+                frames.append((sid, {
+                    'lines': [line for _, line, _ in batch],
+                    'offset': batch[-1][0],
+                    'dropped': client.dropped,
+                }))
+                client.dropped = 0
+                client.inflight_since = now
+                if client.lines:
+                    next_timeout = ACK_TIMEOUT if next_timeout is None else min(next_timeout, ACK_TIMEOUT)
+
+        for sid, frame in frames:
+            self.socketio.emit('log_frame', frame, to=sid,
+                               callback=lambda *args, sid=sid: self.ack(sid))
+        return next_timeout
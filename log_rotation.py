@@ -0,0 +1,239 @@
+# log_rotation.py - Rotação contínua do log com segmentos gzip e índice de retenção
+import bisect
+import gzip
+import json
+import logging
+import os
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from threading import Lock, Thread
+
+log = logging.getLogger("log-rotation")
+
+SEGMENT_BLOCK_BYTES = 256 * 1024   # Cada bloco vira um membro gzip independente
+SEGMENT_READ_MAX_BYTES = 256 * 1024
+CHECK_INTERVAL = 60                # Segundos entre verificações de rotação
+INDEX_FILE_NAME = "segments.json"
+
+
+class LogRotator:
+    """Rotaciona o arquivo de log por tamanho ou idade.
+
+    Cada segmento rotacionado é gravado como gzip de vários membros (um a cada
+    SEGMENT_BLOCK_BYTES), e o índice guarda onde começa cada membro. Assim um
+    trecho qualquer do segmento pode ser lido descomprimindo só um bloco.
+
+    A rotação é por cópia + truncamento: o bot escreve em modo append no
+    mesmo arquivo e não precisa reabri-lo.
+    """
+
+    def __init__(self, log_file, archive_dir, max_bytes, max_age,
+                 retention_bytes, retention_segments):
+        self.log_file = Path(log_file)
+        self.archive_dir = Path(archive_dir)
+        self.index_file = self.archive_dir / INDEX_FILE_NAME
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.retention_bytes = retention_bytes
+        self.retention_segments = retention_segments
+        self._lock = Lock()
+        self._thread = None
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()
+
+    # --- Índice ---
+    def _load_index(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = {}
+        except (OSError, ValueError) as e:
+            log.error(f"❌ Índice de segmentos inválido, recriando: {e}")
+            index = {}
+        index.setdefault("segments", [])
+        index.setdefault("rotations", 0)
+        index.setdefault("active_base_bytes", 0)
+        if not index.get("active_since"):
+            try:
+                index["active_since"] = os.stat(self.log_file).st_ctime
+            except FileNotFoundError:
+                index["active_since"] = time.time()
+        return index
+
+    def _save_index(self):
+        tmp_file = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1)
+        os.replace(tmp_file, self.index_file)
+
+    def list_segments(self):
+        """Segmentos do mais antigo para o mais recente (sem a tabela de blocos)"""
+        with self._lock:
+            return [{k: v for k, v in seg.items() if k != "blocks"}
+                    for seg in self.index["segments"]]
+
+    # --- Rotação ---
+    def start(self):
+        """Inicia a verificação periódica em background (idempotente)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(CHECK_INTERVAL)
+            self.rotate_if_needed()
+
+    def rotate_if_needed(self):
+        """Rotaciona se o log passou do tamanho ou da idade máxima"""
+        try:
+            size = os.path.getsize(self.log_file)
+        except FileNotFoundError:
+            return False
+        age = time.time() - self.index["active_since"]
+        # Por idade só rotaciona se algo além do cabeçalho da última rotação foi escrito
+        written = size > self.index["active_base_bytes"]
+        if size >= self.max_bytes or (written and age >= self.max_age):
+            return self.rotate()
+        return False
+
+    def rotate(self):
+        """Comprime o conteúdo atual em um novo segmento e trunca o log"""
+        with self._lock:
+            try:
+                return self._rotate_locked()
+            except Exception as e:
+                log.error(f"❌ Erro na rotação do log: {e}")
+                return False
+
+    def _rotate_locked(self):
+        now = time.time()
+        stamp = datetime.fromtimestamp(now).strftime('%Y%m%d-%H%M%S')
+        segment_name = f"{self.log_file.stem}.{stamp}.log.gz"
+        suffix = 1
+        while (self.archive_dir / segment_name).exists():
+            suffix += 1
+            segment_name = f"{self.log_file.stem}.{stamp}-{suffix}.log.gz"
+        segment_path = self.archive_dir / segment_name
+
+        blocks = []
+        total = 0
+        with open(self.log_file, 'r+b') as src, open(segment_path, 'wb') as dst:
+            size = os.fstat(src.fileno()).st_size
+            if size == 0:
+                segment_path.unlink()
+                return False
+            while total < size:
+                chunk = src.read(min(SEGMENT_BLOCK_BYTES, size - total))
+                if not chunk:
+                    break
+                blocks.append([total, dst.tell()])
+                compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+                dst.write(compressor.compress(chunk) + compressor.flush())
+                total += len(chunk)
+
+            # O que foi escrito durante a cópia é preservado no arquivo truncado
+            src.seek(total)
+            tail = src.read()
+            src.truncate(0)
+            compressed = dst.tell()
+
+        # Em modo append, como o bot, para não sobrescrever o que ele escrever agora
+        header = f"# Log rotacionado em {datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')} -> {segment_name}\n".encode('utf-8')
+        with open(self.log_file, 'ab') as f:
+            f.write(header + tail)
+
+        self.index["segments"].append({
+            "file": segment_name,
+            "start": self.index["active_since"],
+            "end": now,
+            "bytes": total,
+            "compressed_bytes": compressed,
+            "blocks": blocks,
+        })
+        self.index["active_since"] = now
+        self.index["active_base_bytes"] = len(header)
+        self.index["rotations"] += 1
+        self._enforce_retention()
+        self._save_index()
+        log.info(f"📦 Log rotacionado para: {segment_path} ({total} -> {compressed} bytes)")
+        return True
+
+    def _enforce_retention(self):
+        segments = self.index["segments"]
+        while segments and (
+            len(segments) > self.retention_segments or
+            sum(seg["compressed_bytes"] for seg in segments) > self.retention_bytes
+        ):
+            oldest = segments.pop(0)
+            try:
+                (self.archive_dir / oldest["file"]).unlink()
+            except FileNotFoundError:
+                pass
+            log.info(f"🗑️ Segmento removido pela retenção: {oldest['file']}")
+
+    # --- Leitura de segmentos ---
+    def iter_segment_lines(self, since=None, until=None):
+        """Linhas (bytes) dos segmentos que cobrem [since, until], do mais antigo ao mais recente
+
+        Os segmentos são lidos em streaming, sem descomprimir um inteiro na memória.
+        """
+        with self._lock:
+            segments = list(self.index["segments"])
+        for segment in segments:
+            if since is not None and segment["end"] < since:
+                continue
+            if until is not None and segment["start"] > until:
+                break
+            try:
+                f = gzip.open(self.archive_dir / segment["file"], 'rb')
+            except FileNotFoundError:
+                continue  # Removido pela retenção depois da cópia do índice
+            with f:
+                yield from f
+
+    def read_segment(self, name, offset=0, max_bytes=SEGMENT_READ_MAX_BYTES):
+        """Lê um trecho do segmento a partir do offset (não comprimido)
+
+        Só os blocos gzip que cobrem o trecho pedido são descomprimidos.
+        Retorna None se o segmento não estiver no índice.
+        """
+        with self._lock:
+            segment = next((seg for seg in self.index["segments"] if seg["file"] == name), None)
+        if segment is None:
+            return None
+
+        blocks = segment["blocks"]
+        offset = max(0, min(offset, segment["bytes"]))
+        first = max(0, bisect.bisect_right([b[0] for b in blocks], offset) - 1)
+        data = b""
+        data_start = blocks[first][0] if blocks else 0
+
+        with open(self.archive_dir / name, 'rb') as f:
+            for i in range(first, len(blocks)):
+                if data_start + len(data) >= offset + max_bytes:
+                    break
+                start = blocks[i][1]
+                end = blocks[i + 1][1] if i + 1 < len(blocks) else segment["compressed_bytes"]
+                f.seek(start)
+                data += zlib.decompress(f.read(end - start), 31)
+
+        chunk = data[offset - data_start:offset - data_start + max_bytes]
+        # Corta na última linha completa para não partir caracteres UTF-8
+        if offset + len(chunk) < segment["bytes"] and not chunk.endswith(b"\n"):
+            cut = chunk.rfind(b"\n")
+            if cut != -1:
+                chunk = chunk[:cut + 1]
+        next_offset = offset + len(chunk)
+        return {
+            "file": name,
+            "logs": chunk.decode('utf-8', errors='replace'),
+            "offset": offset,
+            "next_offset": next_offset,
+            "bytes": segment["bytes"],
+            "has_more": next_offset < segment["bytes"],
+        }
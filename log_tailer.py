@@ -0,0 +1,228 @@
+# log_tailer.py - Acompanhamento do arquivo de log orientado a eventos (inotify)
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+
+log = logging.getLogger("log-tailer")
+
+# Constantes do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+READ_CHUNK = 64 * 1024
+
+
+class InotifyWatcher:
+    """Observa o diretório do log via inotify (ctypes, sem dependências externas).
+
+    Observar o diretório, e não o arquivo, permite enxergar renomeações e a
+    recriação do arquivo. Só acorda quando há escrita no diretório.
+    """
+
+    def __init__(self, path):
+        self.directory = os.path.dirname(os.path.abspath(path)) or "."
+        self.name = os.fsencode(os.path.basename(path))
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(self.directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, os.strerror(err))
+
+    def wait(self, timeout=None):
+        """Bloqueia até haver evento para o arquivo observado (True) ou timeout (False)"""
+        # select.select é substituído pela versão verde quando o eventlet faz monkey patch
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            data = os.read(self.fd, READ_CHUNK)
+        except BlockingIOError:
+            return False
+
+        pos = 0
+        relevant = False
+        while pos + _EVENT_HEADER.size <= len(data):
+            _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b"\0")
+            pos += length
+            if name == self.name:
+                relevant = True
+        return relevant
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class PollingWatcher:
+    """Fallback em Python puro para sistemas sem inotify: verifica por intervalo"""
+
+    def __init__(self, path, interval=0.5):
+        self.interval = interval
+
+    def wait(self, timeout=None):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        return True
+
+    def close(self):
+        pass
+
+
+def create_watcher(path, poll_interval=0.5):
+    """Usa inotify quando disponível, senão cai para polling"""
+    try:
+        watcher = InotifyWatcher(path)
+        log.info("👁️ Monitoramento de log via inotify")
+        return watcher
+    except (OSError, AttributeError) as e:
+        log.warning(f"⚠️ inotify indisponível ({e}), usando polling a cada {poll_interval}s")
+        return PollingWatcher(path, poll_interval)
+
+
+class LogTailer:
+    """Acompanha o final do arquivo de log mantendo um único descritor aberto.
+
+    on_data(text, offset) recebe apenas linhas completas e o offset em bytes
+    logo após elas; on_reset(reason) é chamado quando o arquivo é truncado
+    ("truncated") ou substituído por outro ("rotated").
+    """
+
+    def __init__(self, path, on_data, on_reset=None, poll_interval=0.5):
+        self.path = str(path)
+        self.on_data = on_data
+        self.on_reset = on_reset
+        self.poll_interval = poll_interval
+        self._fh = None
+        self._inode = None
+        self._position = 0
+        self._pending = b""
+        self._stopped = False
+        self.bytes_delivered = 0
+
+    @property
+    def position(self):
+        """Offset (em bytes) da última linha completa entregue"""
+        return self._position - len(self._pending)
+
+    def run(self, start_offset=None):
+        """Loop principal; bloqueia a thread (verde) que o executa
+
+        Sem start_offset começa no fim do arquivo.
+        """
+        self._open(at_end=True)
+        if self._fh is not None and start_offset is not None and start_offset <= self._position:
+            self._fh.seek(start_offset)
+            self._position = start_offset
+            self._drain()
+        watcher = create_watcher(self.path, self.poll_interval)
+        try:
+            while not self._stopped:
+                try:
+                    if watcher.wait():
+                        self.check()
+                except Exception as e:
+                    log.error(f"❌ Erro no monitoramento: {e}")
+                    time.sleep(2)
+        finally:
+            watcher.close()
+            self._close()
+
+    @property
+    def lag_bytes(self):
+        """Bytes já escritos no arquivo que ainda não foram entregues"""
+        try:
+            return max(0, os.path.getsize(self.path) - self.position) if self._fh else 0
+        except FileNotFoundError:
+            return 0
+
+    def stop(self):
+        self._stopped = True
+
+    def check(self):
+        """Lê dados novos e trata truncamento/rotação do arquivo"""
+        if self._fh is None:
+            if self._open(at_end=False):
+                self._reset("rotated")
+            self._drain()
+            return
+
+        # Termina de ler o arquivo atual antes de decidir se ele foi trocado
+        self._drain()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+
+        if st.st_ino != self._inode:
+            self._close()
+            if self._open(at_end=False):
+                self._reset("rotated")
+                self._drain()
+        elif st.st_size < self._position:
+            self._fh.seek(0)
+            self._position = 0
+            self._pending = b""
+            self._reset("truncated")
+            self._drain()
+
+    def _open(self, at_end):
+        try:
+            self._fh = open(self.path, "rb")
+        except FileNotFoundError:
+            self._fh = None
+            return False
+        st = os.fstat(self._fh.fileno())
+        self._inode = st.st_ino
+        self._pending = b""
+        self._position = st.st_size if at_end else 0
+        self._fh.seek(self._position)
+        return True
+
+    def _close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _reset(self, reason):
+        log.info(f"🔁 Arquivo de log {reason}: {self.path}")
+        if self.on_reset:
+            self.on_reset(reason)
+
+    def _drain(self):
+        while True:
+            data = self._fh.read(READ_CHUNK)
+            if not data:
+                break
+            self._position += len(data)
+            data = self._pending + data
+            cut = data.rfind(b"\n")
+            if cut == -1:
+                self._pending = data
+                continue
+            self._pending = data[cut + 1:]
+            self.bytes_delivered += cut + 1
+            self.on_data(data[:cut + 1].decode("utf-8", errors="replace"), self.position)
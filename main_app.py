@@ -1,49 +1,77 @@
 # main_app.py (v1.6 - Com Botão Reiniciar e Limpeza de Logs)
 import os
-import subprocess
+import json
 import logging
 import sys
 import traceback
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from itertools import chain, islice
+from flask import (Flask, Response, g, render_template, request, jsonify, session, redirect,
+                   stream_with_context, url_for)
 from flask_socketio import SocketIO, emit
 from threading import Lock, Thread
+from collections import deque
 import time
 from datetime import datetime
 
 # --- Configuração do Logging PRIMEIRO ---
+# INFO por padrão: em DEBUG o engineio/socketio registram cada pacote, o que
+# deixa o import e o servidor mais lentos. Use LOG_LEVEL=DEBUG para investigar.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# getLevelName devolve o número só para nomes conhecidos (getLevelNamesMapping é 3.11+)
+LOG_LEVEL_VALID = isinstance(logging.getLevelName(LOG_LEVEL), int)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=LOG_LEVEL if LOG_LEVEL_VALID else logging.INFO,
     format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
     handlers=[logging.StreamHandler()]
 )
 log = logging.getLogger("web-server")
+if not LOG_LEVEL_VALID:
+    log.warning(f"⚠️ LOG_LEVEL inválido: {LOG_LEVEL!r}, usando INFO")
 
-# --- DEBUG: Verificar imports críticos ---
 log.info("🚀 Iniciando main_app.py...")
 
+# config.py já carrega o .env (load_dotenv)
 try:
-    log.info("📦 Importando dotenv...")
-    from dotenv import dotenv_values, load_dotenv
-    load_dotenv()
-    log.info("✅ dotenv importado com sucesso")
-except Exception as e:
-    log.error(f"❌ Erro ao importar dotenv: {e}")
-    sys.exit(1)
-
-try:
-    log.info("📦 Importando config...")
-    from config import ADMIN_USER, ADMIN_PASSWORD, LOG_FILE
+    from config import (ADMIN_USER, ADMIN_PASSWORD, LOG_FILE, LOG_ARCHIVE_DIR,
+                        LOG_ROTATE_MAX_MB, LOG_ROTATE_MAX_HOURS,
+                        LOG_RETENTION_MAX_MB, LOG_RETENTION_MAX_SEGMENTS,
+                        STRUCTURED_LOG_ENABLED, STRUCTURED_LOG_FILE)
     log.info(f"✅ Config importado - Admin: {ADMIN_USER}, Log: {LOG_FILE}")
 except Exception as e:
     log.error(f"❌ Erro ao importar config: {e}")
     traceback.print_exc()
     sys.exit(1)
 
+from assets import AssetManifest
+from config_store import ConfigValidationError, EnvConfigStore
+from log_broadcast import LogBroadcaster
+from log_rotation import LogRotator
+from log_tailer import LogTailer
+from metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from structured_logging import LogSearchIndex, filter_records, parse_json_line, parse_text_line
+from supervisor import BotSupervisor
+
 # --- Gerenciamento de Log Persistente ---
+LOG_CHUNK_MAX_BYTES = 256 * 1024  # Máximo de bytes devolvidos por chamada de /api/logs
+RECENT_LINES_MAX = 1000           # Linhas mantidas em memória para novas conexões
+OLDER_LINES_PAGE_MAX = 1000       # Máximo de linhas por página ao voltar no histórico
+
 class PersistentLogManager:
-    def __init__(self, log_file_path):
+    def __init__(self, log_file_path, recent_lines=RECENT_LINES_MAX):
         self.log_file = log_file_path
+        # Ring buffer de (offset, linha) alimentado pelo tailer
+        self._recent = deque(maxlen=recent_lines)
+        self._recent_end = 0
+        self._recent_inode = None
+        self._recent_lock = Lock()
         self.ensure_log_file_exists()
+        self.rotator = LogRotator(
+            log_file_path, LOG_ARCHIVE_DIR,
+            max_bytes=LOG_ROTATE_MAX_MB * 1024 * 1024,
+            max_age=LOG_ROTATE_MAX_HOURS * 3600,
+            retention_bytes=LOG_RETENTION_MAX_MB * 1024 * 1024,
+            retention_segments=LOG_RETENTION_MAX_SEGMENTS,
+        )
     
     def ensure_log_file_exists(self):
         """Garante que o arquivo de log existe"""
@@ -66,6 +94,133 @@ class PersistentLogManager:
             log.error(f"❌ Erro ao ler log: {e}")
             return f"Erro ao carregar log: {str(e)}"
     
+    def read_log_from_offset(self, offset=0, inode=None, max_bytes=LOG_CHUNK_MAX_BYTES):
+        """Retorna apenas os bytes novos a partir de offset (cursor incremental)
+
+        max_bytes=None lê até o fim do arquivo.
+        """
+        try:
+            with open(self.log_file, 'rb') as f:
+                st = os.fstat(f.fileno())
+                reset = False
+                # Arquivo trocado (rotação) ou truncado (limpeza): recomeça do início
+                if inode is not None and inode != st.st_ino:
+                    reset = True
+                elif offset > st.st_size:
+                    reset = True
+                if reset or offset < 0:
+                    offset = 0
+
+                f.seek(offset)
+                data = f.read(max_bytes if max_bytes else -1)
+                # Só há "mais" se a leitura bateu no limite; uma linha final sem
+                # '\n' fica para a próxima consulta, não para um novo pedido imediato
+                capped = bool(max_bytes) and len(data) == max_bytes
+                # Devolve só linhas completas para não quebrar caracteres UTF-8
+                if data and not data.endswith(b'\n'):
+                    cut = data.rfind(b'\n')
+                    if cut != -1:
+                        data = data[:cut + 1]
+                    elif max_bytes and len(data) < max_bytes:
+                        data = b''
+
+                new_offset = offset + len(data)
+                return {
+                    "logs": data.decode('utf-8', errors='replace'),
+                    "offset": new_offset,
+                    "inode": st.st_ino,
+                    "file_size": st.st_size,
+                    "reset": reset,
+                    "has_more": capped and new_offset < st.st_size,
+                }
+        except FileNotFoundError:
+            self.ensure_log_file_exists()
+            return {"logs": "", "offset": 0, "inode": None, "file_size": 0,
+                    "reset": True, "has_more": False}
+
+    def read_lines_before(self, before, limit):
+        """Lê até `limit` linhas completas que terminam antes do byte `before`
+
+        Lê o arquivo de trás para frente em blocos, então o custo é
+        proporcional ao número de linhas pedidas, não ao tamanho do arquivo.
+        Retorna lista de (offset, linha).
+        """
+        block_size = 64 * 1024
+        with open(self.log_file, 'rb') as f:
+            end = min(before, os.fstat(f.fileno()).st_size)
+            pos = end
+            data = b''
+            while pos > 0 and data.count(b'\n') <= limit:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+
+        # Descarta a primeira linha parcial (exceto se chegamos ao início do arquivo)
+        start = pos
+        if pos > 0:
+            cut = data.find(b'\n')
+            data = data[cut + 1:]
+            start = pos + cut + 1
+
+        lines = []
+        offset = start
+        for raw in data.splitlines(keepends=True):
+            lines.append((offset, raw.decode('utf-8', errors='replace')))
+            offset += len(raw)
+        return lines[-limit:] if limit else []
+
+    def load_recent_lines(self):
+        """Preenche o ring buffer com o final do arquivo; retorna o offset do fim"""
+        try:
+            with open(self.log_file, 'rb') as f:
+                st = os.fstat(f.fileno())
+            lines = self.read_lines_before(st.st_size, self._recent.maxlen)
+        except FileNotFoundError:
+            self.ensure_log_file_exists()
+            return self.load_recent_lines()
+
+        # Uma linha final ainda sem '\n' fica para o tailer entregar
+        if lines and not lines[-1][1].endswith('\n'):
+            lines.pop()
+        with self._recent_lock:
+            self._recent.clear()
+            self._recent.extend(lines)
+            self._recent_end = lines[-1][0] + len(lines[-1][1].encode('utf-8')) if lines else 0
+            self._recent_inode = st.st_ino
+            return self._recent_end
+
+    def append_recent(self, text, end_offset):
+        """Adiciona ao ring buffer as linhas entregues pelo tailer"""
+        raw_lines = text.encode('utf-8').splitlines(keepends=True)
+        offset = end_offset - sum(len(raw) for raw in raw_lines)
+        with self._recent_lock:
+            for raw in raw_lines:
+                self._recent.append((offset, raw.decode('utf-8', errors='replace')))
+                offset += len(raw)
+            self._recent_end = end_offset
+
+    def reset_recent(self):
+        """Esvazia o ring buffer (arquivo truncado ou rotacionado)"""
+        with self._recent_lock:
+            self._recent.clear()
+            self._recent_end = 0
+            try:
+                self._recent_inode = os.stat(self.log_file).st_ino
+            except FileNotFoundError:
+                self._recent_inode = None
+
+    def get_recent_snapshot(self):
+        """Cópia das linhas recentes com os cursores para o cliente"""
+        with self._recent_lock:
+            lines = list(self._recent)
+            return {
+                "lines": [line for _, line in lines],
+                "first_offset": lines[0][0] if lines else self._recent_end,
+                "offset": self._recent_end,
+                "inode": self._recent_inode,
+            }
+
     def clear_log_file(self):
         """Limpa o arquivo de log"""
         try:
@@ -92,26 +247,42 @@ class PersistentLogManager:
             log.error(f"❌ Erro ao adicionar separador: {e}")
     
     def rotate_log_if_needed(self):
-        """Rotaciona o log se ficar muito grande (>5MB)"""
-        try:
-            if os.path.exists(self.log_file):
-                size_mb = os.path.getsize(self.log_file) / (1024 * 1024)
-                if size_mb > 5:
-                    backup_name = f"{self.log_file}.backup.{int(time.time())}"
-                    os.rename(self.log_file, backup_name)
-                    log.info(f"📦 Log rotacionado para: {backup_name}")
-                    self.ensure_log_file_exists()
-        except Exception as e:
-            log.error(f"❌ Erro na rotação do log: {e}")
+        """Rotaciona o log (gzip + índice) se passou do tamanho ou idade máxima"""
+        return self.rotator.rotate_if_needed()
 
 # Inicializa o gerenciador de log
 log_manager = PersistentLogManager(LOG_FILE)
+log_manager.rotator.start()
+
+config_store = EnvConfigStore(".env")
+
+# Busca: usa o sink JSON lines quando habilitado, senão interpreta o log texto
+if STRUCTURED_LOG_ENABLED:
+    search_index = LogSearchIndex(STRUCTURED_LOG_FILE, parse_json_line)
+    structured_rotator = LogRotator(
+        STRUCTURED_LOG_FILE, LOG_ARCHIVE_DIR / "structured",
+        max_bytes=LOG_ROTATE_MAX_MB * 1024 * 1024,
+        max_age=LOG_ROTATE_MAX_HOURS * 3600,
+        retention_bytes=LOG_RETENTION_MAX_MB * 1024 * 1024,
+        retention_segments=LOG_RETENTION_MAX_SEGMENTS,
+    )
+    structured_rotator.start()
+    search_rotator = structured_rotator
+else:
+    search_index = LogSearchIndex(LOG_FILE, parse_text_line)
+    search_rotator = log_manager.rotator
 
 # --- Inicialização da Aplicação ---
 app = Flask(__name__)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "fallback-secret-key-for-development")
 log.info(f"🔑 Flask secret key configurada")
 
+# Assets com hash no nome + gzip, servidos com cache imutável
+asset_manifest = AssetManifest(
+    os.path.join(app.root_path, 'static'),
+    ['style.css', 'app.js', 'vendor/socket.io.min.js'])
+asset_manifest.init_app(app)
+
 try:
     socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*")
     log.info("✅ SocketIO inicializado com eventlet")
@@ -119,30 +290,123 @@ except Exception as e:
     log.error(f"❌ Erro ao inicializar SocketIO: {e}")
     sys.exit(1)
 
-bot_process = None
+supervisor = BotSupervisor(
+    ["python", "-u", "bot_worker.py"],
+    on_state_change=lambda status: socketio.emit('bot_status', status))
 monitor_thread = None
 thread_lock = Lock()
 
+# --- Métricas ---
+http_requests = REGISTRY.counter(
+    "ft_http_requests_total", "Requisições HTTP por rota, método e status",
+    ("route", "method", "status"))
+http_latency = REGISTRY.histogram(
+    "ft_http_request_duration_seconds", "Latência das requisições HTTP por rota", ("route",))
+REGISTRY.counter("ft_bot_restarts_total", "Reinícios do bot pelo dashboard").set_function(
+    lambda: supervisor.restart_count)
+REGISTRY.gauge("ft_bot_uptime_seconds", "Tempo desde que o processo do bot foi iniciado").set_function(
+    supervisor.uptime)
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        http_latency.labels(route).observe(time.perf_counter() - started)
+        http_requests.labels(route, request.method, response.status_code).inc()
+    return response
+
 # --- Health Check ---
 @app.route('/health')
 def health_check():
     """Endpoint de health check simplificado"""
     return {"status": "healthy", "timestamp": time.time()}, 200
 
+# --- Métricas (formato Prometheus) ---
+@app.route('/metrics')
+def metrics():
+    """Endpoint de métricas no formato texto do Prometheus"""
+    return Response(REGISTRY.render(), content_type=METRICS_CONTENT_TYPE)
+
 # --- Endpoint para obter logs ---
 @app.route('/api/logs')
 def get_logs():
-    """API endpoint para obter logs completos"""
+    """API endpoint incremental: devolve só o que foi escrito após ?offset=
+
+    O cliente envia o último offset e inode recebidos; se o arquivo foi
+    truncado ou rotacionado a resposta vem com reset=true a partir do byte 0.
+    """
     if not session.get('logged_in'):
         return jsonify(error="Não autorizado"), 403
     
     try:
-        content = log_manager.get_full_log_content()
-        return jsonify({
-            "logs": content,
-            "timestamp": time.time(),
-            "file_size": len(content)
-        })
+        offset = request.args.get('offset', default=0, type=int)
+        inode = request.args.get('inode', default=None, type=int)
+        result = log_manager.read_log_from_offset(offset, inode)
+        result["timestamp"] = time.time()
+        return jsonify(result)
+    except Exception as e:
+        return jsonify(error=str(e)), 500
+
+# --- Busca nos logs ---
+@app.route('/api/logs/search')
+def search_logs():
+    """Filtra logs por nível mínimo, janela de tempo e substring
+
+    Parâmetros: level, since, until (epoch em segundos), q, limit.
+    Busca nos segmentos rotacionados que cobrem a janela (streaming do gzip,
+    sem índice) e depois no arquivo ativo (índice por tempo). A resposta é
+    NDJSON em streaming (um registro por linha).
+    """
+    if not session.get('logged_in'):
+        return jsonify(error="Não autorizado"), 403
+    
+    level = (request.args.get('level') or '').upper() or None
+    since = request.args.get('since', type=float)
+    until = request.args.get('until', type=float)
+    query = request.args.get('q') or None
+    limit = max(1, min(request.args.get('limit', default=1000, type=int), 10000))
+    
+    try:
+        # Primeira leitura fora do streaming: erro de I/O vira 500, não NDJSON cortado
+        search_index.refresh()
+    except OSError as e:
+        return jsonify(error=str(e)), 500
+    
+    def generate():
+        history = filter_records(search_rotator.iter_segment_lines(since, until),
+                                 search_index.parser, level, since, until, query)
+        records = chain(history, search_index.search(level, since, until, query, limit))
+        for record in islice(records, limit):
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# --- Segmentos rotacionados ---
+@app.route('/api/logs/segments')
+def list_log_segments():
+    """Lista os segmentos comprimidos com intervalo de tempo e tamanhos"""
+    if not session.get('logged_in'):
+        return jsonify(error="Não autorizado"), 403
+    
+    return jsonify(segments=log_manager.rotator.list_segments())
+
+@app.route('/api/logs/segments/<name>')
+def read_log_segment(name):
+    """Lê um trecho de um segmento: ?offset= em bytes não comprimidos"""
+    if not session.get('logged_in'):
+        return jsonify(error="Não autorizado"), 403
+    
+    try:
+        offset = request.args.get('offset', default=0, type=int)
+        result = log_manager.rotator.read_segment(name, offset)
+        if result is None:
+            return jsonify(error="Segmento não encontrado"), 404
+        return jsonify(result)
     except Exception as e:
         return jsonify(error=str(e)), 500
 
@@ -182,6 +446,7 @@ def debug_info():
                 "templates/dashboard.html": os.path.exists("templates/dashboard.html"),
                 "static/style.css": os.path.exists("static/style.css"),
                 "static/app.js": os.path.exists("static/app.js"),
+                "static/vendor/socket.io.min.js": os.path.exists("static/vendor/socket.io.min.js"),
                 "log_file": os.path.exists(LOG_FILE),
             },
             "log_info": {
@@ -227,8 +492,8 @@ def dashboard():
         if not session.get('logged_in'):
             return redirect(url_for('login'))
         
-        config_values = dotenv_values(".env") or {}
-        bot_status = "Rodando" if bot_process and bot_process.poll() is None else "Parado"
+        config_values = config_store.get()
+        bot_status = supervisor.status()["label"]
         
         return render_template('dashboard.html', config=config_values, status=bot_status)
     except Exception as e:
@@ -242,125 +507,109 @@ def save_config():
         if not session.get('logged_in'): 
             return jsonify(error="Não autorizado"), 403
         
-        data = request.json
-        current_config = dotenv_values(".env") or {}
-        
-        for key, value in data.items():
-            if value:
-                current_config[key.upper()] = value
-                
-        with open(".env", "w") as f:
-            for key, value in current_config.items():
-                f.write(f"{key}={value}\n")
-                
-        return jsonify(message="Configurações salvas com sucesso!")
+        changed = config_store.update(request.get_json(silent=True))
+        return jsonify(message="Configurações salvas com sucesso!", changed=changed)
+    except ConfigValidationError as e:
+        return jsonify(error="Configuração inválida", errors=e.errors), 400
     except Exception as e:
         return jsonify(error=str(e)), 500
 
 # --- Bot Control ---
+def _prepare_new_session():
+    """Executado em background antes de cada início do bot"""
+    log_manager.rotate_log_if_needed()
+    log_manager.append_session_separator()
+
+def _prepare_restart():
+    """Limpa os logs antes de iniciar a nova sessão"""
+    log.info("🧹 Limpando logs...")
+    if log_manager.clear_log_file():
+        log.info("✅ Logs limpos")
+        # Emite evento para atualizar frontend
+        socketio.emit('log_cleared', {'message': 'Logs limpos - Bot reiniciando...'})
+    _prepare_new_session()
+
+@app.route('/bot_status')
+def bot_status():
+    if not session.get('logged_in'):
+        return jsonify(error="Não autorizado"), 403
+    return jsonify(supervisor.status())
+
 @app.route('/start_bot', methods=['POST'])
 def start_bot():
-    global bot_process
     try:
         if not session.get('logged_in'): 
             return jsonify(error="Não autorizado"), 403
         
-        if bot_process and bot_process.poll() is None:
-            return jsonify(message="Bot já está rodando"), 400
-        
-        log_manager.rotate_log_if_needed()
-        log_manager.append_session_separator()
-        
-        bot_process = subprocess.Popen(["python", "-u", "bot_worker.py"])
-        log.info(f"✅ Bot iniciado com PID: {bot_process.pid}")
-        return jsonify(message="Bot iniciado!", pid=bot_process.pid)
+        accepted, message = supervisor.start(before_start=_prepare_new_session)
+        return jsonify(message=message, status=supervisor.status()), 202 if accepted else 400
     except Exception as e:
         return jsonify(error=str(e)), 500
 
 @app.route('/stop_bot', methods=['POST'])
 def stop_bot():
-    global bot_process
     try:
         if not session.get('logged_in'): 
             return jsonify(error="Não autorizado"), 403
         
-        if bot_process and bot_process.poll() is None:
-            bot_process.terminate()
-            bot_process.wait(timeout=5)
-            bot_process = None
-            return jsonify(message="Bot parado com sucesso")
-        
-        return jsonify(message="Bot não estava rodando"), 400
+        accepted, message = supervisor.stop()
+        return jsonify(message=message, status=supervisor.status()), 202 if accepted else 400
     except Exception as e:
         return jsonify(error=str(e)), 500
 
 # --- NOVO: Reiniciar Bot ---
 @app.route('/restart_bot', methods=['POST'])
 def restart_bot():
-    """Reinicia o bot e limpa os logs"""
-    global bot_process
+    """Reinicia o bot e limpa os logs (em background)"""
     try:
         if not session.get('logged_in'):
             return jsonify(error="Não autorizado"), 403
         
         log.info("🔄 Iniciando reinicialização do bot...")
-        
-        # 1. Para o bot se estiver rodando
-        if bot_process and bot_process.poll() is None:
-            log.info("⏹️ Parando bot atual...")
-            bot_process.terminate()
-            bot_process.wait(timeout=10)
-            bot_process = None
-            log.info("✅ Bot parado")
-        
-        # 2. Limpa os logs
-        log.info("🧹 Limpando logs...")
-        if log_manager.clear_log_file():
-            log.info("✅ Logs limpos")
-            # Emite evento para atualizar frontend
-            socketio.emit('log_cleared', {'message': 'Logs limpos - Bot reiniciando...'})
-        
-        # 3. Aguarda um momento
-        time.sleep(2)
-        
-        # 4. Rotaciona se necessário e adiciona separador
-        log_manager.rotate_log_if_needed()
-        log_manager.append_session_separator()
-        
-        # 5. Inicia o bot novamente
-        bot_process = subprocess.Popen(["python", "-u", "bot_worker.py"])
-        log.info(f"🚀 Bot reiniciado com PID: {bot_process.pid}")
-        
-        return jsonify(message="Bot reiniciado e logs limpos!", pid=bot_process.pid)
+        accepted, message = supervisor.restart(before_start=_prepare_restart)
+        return jsonify(message=message, status=supervisor.status()), 202 if accepted else 400
         
     except Exception as e:
         log.error(f"❌ Erro ao reiniciar bot: {e}")
         return jsonify(error=str(e)), 500
 
-# --- Thread de monitoramento de logs ---
-def monitor_log_file():
-    """Thread para monitorar arquivo de log"""
-    log.info("🔍 Iniciando monitoramento de logs...")
-    
-    last_position = 0
-    
-    while True:
-        try:
-            if os.path.exists(LOG_FILE):
-                with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                    f.seek(last_position)
-                    new_lines = f.read()
-                    
-                    if new_lines:
-                        # Envia novas linhas via WebSocket
-                        socketio.emit('new_log_line', {'line': new_lines})
-                        last_position = f.tell()
-            
-            time.sleep(0.5)  # Check a cada 0.5 segundos
-            
-        except Exception as e:
-            log.error(f"❌ Erro no monitoramento: {e}")
-            time.sleep(2)
+# --- Monitoramento de logs (inotify) ---
+def _emit_log_data(text, offset):
+    """Atualiza o ring buffer e enfileira as novas linhas para os clientes"""
+    log_manager.append_recent(text, offset)
+    log_broadcaster.publish(text, offset)
+
+def _emit_log_reset(reason):
+    """Avisa os clientes que o arquivo foi truncado ou rotacionado"""
+    log_manager.reset_recent()
+    log_broadcaster.reset()
+    socketio.emit('log_reset', {'reason': reason, 'timestamp': time.time()})
+
+log_broadcaster = LogBroadcaster(socketio)
+
+REGISTRY.gauge("ft_socketio_clients", "Clientes socket.io conectados").set_function(
+    lambda: len(log_broadcaster.clients))
+REGISTRY.gauge("ft_log_tailer_lag_bytes", "Bytes escritos no log ainda não entregues pelo tailer").set_function(
+    lambda: log_tailer.lag_bytes)
+REGISTRY.counter("ft_log_bytes_streamed_total", "Bytes de log enviados aos clientes em frames (somados por cliente)").set_function(
+    lambda: log_broadcaster.bytes_sent)
+REGISTRY.gauge("ft_log_file_size_bytes", "Tamanho atual do arquivo de log").set_function(
+    lambda: os.path.getsize(LOG_FILE))
+REGISTRY.counter("ft_log_rotations_total", "Rotações do arquivo de log").set_function(
+    lambda: log_manager.rotator.index["rotations"])
+
+def ensure_log_monitor():
+    """Inicia o tailer a partir do ponto onde o ring buffer termina"""
+    global monitor_thread
+    with thread_lock:
+        if monitor_thread is None or not monitor_thread.is_alive():
+            start_offset = log_manager.load_recent_lines()
+            monitor_thread = Thread(target=log_tailer.run, args=(start_offset,), daemon=True)
+            monitor_thread.start()
+            log.info("🧵 Thread de monitoramento iniciada")
+    log_broadcaster.start()
+
+log_tailer = LogTailer(LOG_FILE, _emit_log_data, _emit_log_reset)
 
 # --- WebSocket Events ---
 @socketio.on('connect')
@@ -371,29 +620,53 @@ def handle_connect(auth=None):
             
         log.info("🔌 Cliente conectado ao dashboard")
         
-        # Envia log completo
-        full_log_content = log_manager.get_full_log_content()
+        ensure_log_monitor()
+        
+        # Registra antes do snapshot para não perder linhas entre um e outro;
+        # o que já estiver no snapshot é descartado da fila pelo offset
+        log_broadcaster.register(request.sid)
+        
+        # Envia só as linhas recentes (ring buffer); o restante é paginado sob demanda
+        snapshot = log_manager.get_recent_snapshot()
+        log_broadcaster.set_offset(request.sid, snapshot['offset'])
         emit('historical_logs', {
-            'logs': full_log_content,
+            'logs': ''.join(snapshot['lines']),
+            'offset': snapshot['offset'],
+            'first_offset': snapshot['first_offset'],
+            'inode': snapshot['inode'],
+            'has_more_before': snapshot['first_offset'] > 0,
             'timestamp': time.time()
         })
         
-        # Inicia thread de monitoramento se necessário
-        global monitor_thread
-        with thread_lock:
-            if monitor_thread is None or not monitor_thread.is_alive():
-                monitor_thread = Thread(target=monitor_log_file, daemon=True)
-                monitor_thread.start()
-                log.info("🧵 Thread de monitoramento iniciada")
-        
         return True
         
     except Exception as e:
         log.error(f"❌ Erro no connect: {e}")
         return False
 
+@socketio.on('load_older_logs')
+def handle_load_older_logs(data=None):
+    """Paginação para trás a partir do primeiro offset que o cliente possui"""
+    if not session.get('logged_in'):
+        return
+    
+    try:
+        data = data or {}
+        before = int(data.get('before', 0))
+        limit = min(int(data.get('limit', 500)), OLDER_LINES_PAGE_MAX)
+        lines = log_manager.read_lines_before(before, limit) if before > 0 else []
+        first_offset = lines[0][0] if lines else 0
+        emit('older_logs', {
+            'logs': ''.join(line for _, line in lines),
+            'first_offset': first_offset,
+            'has_more_before': first_offset > 0
+        })
+    except Exception as e:
+        log.error(f"❌ Erro ao carregar logs anteriores: {e}")
+
 @socketio.on('disconnect')
 def handle_disconnect():
+    log_broadcaster.unregister(request.sid)
     log.info("🔌 Cliente desconectado")
 
 # --- Error Handlers ---
@@ -3,7 +3,7 @@
 
 import os
 import sys
-import subprocess
+import importlib.util
 import logging
 from pathlib import Path
 
@@ -59,19 +59,19 @@ def check_dependencies():
     log = logging.getLogger("startup")
     log.info("📦 Verificando dependências...")
     
-    try:
-        import flask
-        import flask_socketio
-        import playwright
-        import httpx
-        import bs4
-        import requests
-        log.info("✅ Todas as dependências estão instaladas")
-        return True
-    except ImportError as e:
-        log.error(f"❌ Dependência faltando: {e}")
+    # find_spec só localiza o pacote, sem importá-lo (playwright e cia. são
+    # pesados e só o bot_worker precisa deles)
+    required = ["flask", "flask_socketio", "eventlet", "dotenv",
+                "playwright", "httpx", "bs4", "requests"]
+    missing = [name for name in required if importlib.util.find_spec(name) is None]
+    
+    if missing:
+        log.error(f"❌ Dependência faltando: {', '.join(missing)}")
         log.info("💡 Execute: pip install -r requirements.txt")
         return False
+    
+    log.info("✅ Todas as dependências estão instaladas")
+    return True
 
 def check_ports():
     """Verifica se a porta está disponível"""
@@ -99,6 +99,14 @@ def check_project_integrity():
         "session_manager.py",
         "captcha_solvers.py",
         "config.py",
+        "assets.py",
+        "config_store.py",
+        "log_broadcast.py",
+        "log_rotation.py",
+        "log_tailer.py",
+        "metrics.py",
+        "structured_logging.py",
+        "supervisor.py",
         "templates/dashboard.html",
         "templates/login.html",
         "static/app.js",
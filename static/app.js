@@ -7,47 +7,192 @@ document.addEventListener('DOMContentLoaded', function() {
     const logOutput = document.getElementById('log-output');
     const statusElement = document.getElementById('bot-status');
     const logInfo = document.getElementById('log-info');
+    const statusIndicator = document.getElementById('status-indicator');
+    if (statusIndicator) statusIndicator.textContent = '🟢 Normal';
     
     if (!logOutput) {
         console.error('❌ Elemento log-output não encontrado!');
         return;
     }
     
-    // Função para scroll automático
-    function scrollToBottom() {
-        logOutput.scrollTop = logOutput.scrollHeight;
+    // === VISUALIZADOR DE LOG VIRTUALIZADO ===
+    // Mantém as linhas em um array limitado e só coloca no DOM as que estão
+    // visíveis; o custo de cada atualização não cresce com o tamanho do log.
+    const MAX_LOG_LINES = 50000;
+    const OVERSCAN_LINES = 20;
+    
+    function createLogView(container, follow = true, onTrim = null) {
+        container.textContent = '';
+        const spacer = document.createElement('div');
+        spacer.className = 'log-spacer';
+        const viewport = document.createElement('div');
+        viewport.className = 'log-window';
+        spacer.appendChild(viewport);
+        container.appendChild(spacer);
+        
+        let lines = [];
+        let lineHeight = 0;
+        let paddingTop = 0;
+        let followBottom = follow;
+        let renderScheduled = false;
+        
+        function measureLineHeight() {
+            viewport.textContent = 'X';
+            lineHeight = viewport.getBoundingClientRect().height || 17;
+            paddingTop = parseFloat(getComputedStyle(container).paddingTop) || 0;
+        }
+        
+        function isAtBottom() {
+            return container.scrollTop + container.clientHeight >= container.scrollHeight - lineHeight;
+        }
+        
+        function render() {
+            renderScheduled = false;
+            spacer.style.height = `${lines.length * lineHeight}px`;
+            if (followBottom) container.scrollTop = container.scrollHeight;
+            // O spacer começa depois do padding do container
+            const first = Math.max(0, Math.floor((container.scrollTop - paddingTop) / lineHeight) - OVERSCAN_LINES);
+            const count = Math.ceil(container.clientHeight / lineHeight) + 2 * OVERSCAN_LINES;
+            viewport.style.transform = `translateY(${first * lineHeight}px)`;
+            viewport.textContent = lines.slice(first, first + count).join('\n');
+        }
+        
+        function scheduleRender() {
+            if (!renderScheduled) {
+                renderScheduled = true;
+                requestAnimationFrame(render);
+            }
+        }
+        
+        function splitLines(text) {
+            const parts = text.split('\n');
+            if (parts.length && parts[parts.length - 1] === '') parts.pop();
+            return parts;
+        }
+        
+        container.addEventListener('scroll', function() {
+            // Só segue o final enquanto o usuário está no final
+            followBottom = isAtBottom();
+            scheduleRender();
+        });
+        
+        measureLineHeight();
+        
+        return {
+            append(text) {
+                if (!text) return;
+                const added = splitLines(text);
+                for (let i = 0; i < added.length; i++) lines.push(added[i]);
+                // Corta em lotes para não pagar um splice a cada frame
+                if (lines.length > MAX_LOG_LINES + 1000) {
+                    const removed = lines.length - MAX_LOG_LINES;
+                    lines.splice(0, removed);
+                    if (!followBottom) container.scrollTop -= removed * lineHeight;
+                    if (onTrim) onTrim();
+                }
+                scheduleRender();
+            },
+            prepend(text) {
+                let added = splitLines(text || '');
+                // No limite, descarta as linhas antigas da página, nunca o final ao vivo
+                const room = Math.max(0, MAX_LOG_LINES - lines.length);
+                if (added.length > room) added = added.slice(added.length - room);
+                if (!added.length) return;
+                lines = added.concat(lines);
+                // Preserva a posição de leitura ao inserir conteúdo acima
+                spacer.style.height = `${lines.length * lineHeight}px`;
+                container.scrollTop += added.length * lineHeight;
+                followBottom = false;
+                scheduleRender();
+            },
+            replace(text) {
+                lines = splitLines(text || '');
+                followBottom = follow;
+                if (!follow) container.scrollTop = 0;
+                scheduleRender();
+            },
+            scrollToBottom() {
+                followBottom = true;
+                scheduleRender();
+            },
+            isFull() {
+                return lines.length >= MAX_LOG_LINES;
+            },
+            getText() {
+                return lines.join('\n') + '\n';
+            }
+        };
+    }
+    
+    // Linhas antigas cortadas pelo limite: a página anterior não é mais contígua
+    const logView = createLogView(logOutput, true, function() {
+        firstOffset = 0;
+        updateLoadOlderButton(false);
+    });
+    
+    // Status do bot enviado pelo supervisor (resposta HTTP ou evento bot_status)
+    function updateBotStatus(status) {
+        if (!status || !statusElement) return;
+        let text = status.label;
+        if (status.state === 'stopped' && status.last_exit_code !== null) {
+            text += ` (código ${status.last_exit_code})`;
+        }
+        statusElement.textContent = text;
     }
     
-    // Carrega logs via API
+    // Cursor do log no servidor (byte offset + inode do arquivo)
+    let logOffset = 0;
+    let logInode = null;
+    // Primeiro byte exibido (para paginar o histórico para trás)
+    let firstOffset = 0;
+    const loadOlderButton = document.getElementById('load-older-logs');
+    
+    function updateLoadOlderButton(hasMore) {
+        if (loadOlderButton) loadOlderButton.style.display = hasMore ? 'inline-block' : 'none';
+    }
+    
+    // Carrega logs via API de forma incremental (só os bytes novos)
     async function loadLogsViaAPI() {
         try {
-            console.log('🔄 Carregando logs via API...');
-            logOutput.textContent = 'Carregando logs via API...';
+            const requestedOffset = logOffset;
+            let params = `offset=${requestedOffset}`;
+            if (logInode !== null) params += `&inode=${logInode}`;
             
-            const response = await fetch('/api/logs');
+            const response = await fetch(`/api/logs?${params}`);
             if (response.ok) {
                 const data = await response.json();
-                logOutput.textContent = data.logs || 'Nenhum log disponível';
+                // O WebSocket avançou o cursor durante a requisição: descarta para não duplicar
+                if (logOffset !== requestedOffset) return;
+                if (data.reset || logOffset === 0) {
+                    logView.replace(data.logs || 'Nenhum log disponível');
+                    firstOffset = 0;
+                    updateLoadOlderButton(false);
+                } else {
+                    logView.append(data.logs);
+                }
+                logOffset = data.offset;
+                logInode = data.inode;
                 if (logInfo) {
-                    logInfo.textContent = `${data.file_size} chars • ${new Date().toLocaleTimeString()}`;
+                    logInfo.textContent = `${data.file_size} bytes • ${new Date().toLocaleTimeString()}`;
                 }
-                scrollToBottom();
-                console.log(`✅ Logs carregados via API (${data.file_size} chars)`);
+                // Arquivo maior que um bloco: continua buscando até alcançar o fim
+                if (data.has_more) loadLogsViaAPI();
             } else {
-                logOutput.textContent = 'Erro ao carregar logs via API: ' + response.statusText;
+                logView.append('Erro ao carregar logs via API: ' + response.statusText + '\n');
                 console.error('❌ Erro ao carregar logs via API:', response.statusText);
             }
         } catch (error) {
-            logOutput.textContent = 'Erro de conexão ao carregar logs: ' + error.message;
+            logView.append('Erro de conexão ao carregar logs: ' + error.message + '\n');
             console.error('❌ Erro na requisição de logs:', error);
         }
     }
     
-    // Carrega logs imediatamente
-    loadLogsViaAPI();
-    
-    // Recarrega logs a cada 10 segundos como fallback
-    setInterval(loadLogsViaAPI, 10000);
+    // Força recarga completa (ex.: após limpar/reiniciar)
+    function reloadLogsViaAPI() {
+        logOffset = 0;
+        logInode = null;
+        loadLogsViaAPI();
+    }
     
     // Inicializa WebSocket se disponível
     if (typeof io !== 'undefined') {
@@ -58,55 +203,93 @@ document.addEventListener('DOMContentLoaded', function() {
             
             socket.on('connect', function() {
                 console.log('✅ WebSocket conectado!');
-                logOutput.textContent += '\n🔌 Conectado em tempo real\n';
-                scrollToBottom();
             });
             
             socket.on('disconnect', function() {
                 console.log('❌ WebSocket desconectado');
-                logOutput.textContent += '\n🔌 Desconectado\n';
-                scrollToBottom();
+                logView.append('🔌 Desconectado\n');
             });
             
+            // Snapshot enviado a cada (re)conexão: substitui o conteúdo exibido
             socket.on('historical_logs', function(data) {
                 console.log('📜 Recebido log histórico via WebSocket');
-                logOutput.textContent = data.logs || 'Nenhum log disponível';
-                logOutput.textContent += '\n📡 Monitoramento em tempo real ativo\n';
+                logView.replace((data.logs || 'Nenhum log disponível\n') + '📡 Monitoramento em tempo real ativo\n');
+                if (data.offset !== undefined) {
+                    logOffset = data.offset;
+                    logInode = data.inode;
+                }
+                firstOffset = data.first_offset || 0;
+                updateLoadOlderButton(data.has_more_before);
                 if (logInfo) {
                     logInfo.textContent = `Tempo real • ${new Date().toLocaleTimeString()}`;
                 }
-                scrollToBottom();
             });
             
-            socket.on('new_log_line', function(data) {
-                console.log('📝 Nova linha de log recebida');
-                logOutput.textContent += data.line;
-                scrollToBottom();
+            // Frames agrupados pelo servidor: um único update de DOM por frame
+            socket.on('log_frame', function(frame, ack) {
+                let text = '';
+                if (frame.dropped) {
+                    text += `⚠️ ${frame.dropped} linhas omitidas (conexão lenta)\n`;
+                }
+                // Linhas já recebidas pelo snapshot/API são ignoradas
+                if (frame.offset > logOffset) {
+                    text += frame.lines.join('');
+                    logOffset = frame.offset;
+                }
+                logView.append(text);
+                // Confirma o recebimento para o servidor liberar o próximo frame
+                if (typeof ack === 'function') ack();
+            });
+            
+            socket.on('older_logs', function(data) {
+                console.log('📜 Recebida página anterior do log');
+                logView.prepend(data.logs);
+                firstOffset = data.first_offset;
+                updateLoadOlderButton(data.has_more_before && !logView.isFull());
+            });
+            
+            window.loadOlderLogs = function() {
+                if (firstOffset > 0 && !logView.isFull()) socket.emit('load_older_logs', { before: firstOffset, limit: 500 });
+            };
+            
+            socket.on('bot_status', function(status) {
+                console.log(`🤖 Bot: ${status.state}`);
+                updateBotStatus(status);
+            });
+            
+            socket.on('log_reset', function(data) {
+                console.log(`🔁 Arquivo de log ${data.reason}`);
+                logView.replace(data.reason === 'rotated'
+                    ? '📦 Log rotacionado - novo arquivo\n'
+                    : '🧹 Log reiniciado\n');
+                logOffset = 0;
+                logInode = null;
+                firstOffset = 0;
+                updateLoadOlderButton(false);
+                if (data.reason === 'truncated') loadSegments();
             });
             
             socket.on('log_cleared', function(data) {
                 console.log('🧹 Logs foram limpos');
-                logOutput.textContent = data.message + '\n\n';
+                logView.replace(data.message + '\n\n');
                 if (logInfo) {
                     logInfo.textContent = `Limpo • ${new Date().toLocaleTimeString()}`;
                 }
-                scrollToBottom();
-                // Recarrega logs após 2 segundos
-                setTimeout(loadLogsViaAPI, 2000);
             });
             
             socket.on('connect_error', function(error) {
                 console.error('❌ Erro de conexão WebSocket:', error);
-                logOutput.textContent += '\n❌ Erro WebSocket: ' + error + '\n';
-                scrollToBottom();
+                logView.append('❌ Erro WebSocket: ' + error + '\n');
             });
             
         } catch (error) {
             console.error('❌ Erro ao inicializar WebSocket:', error);
         }
     } else {
+        // Sem tempo real: busca incremental (só bytes novos) periodicamente
         console.warn('⚠️ Socket.io não disponível, usando apenas API');
-        logOutput.textContent += '\n⚠️ Usando apenas modo API (sem tempo real)\n';
+        loadLogsViaAPI();
+        setInterval(loadLogsViaAPI, 5000);
     }
     
     // === FUNÇÕES GLOBAIS PARA OS BOTÕES ===
@@ -118,8 +301,7 @@ document.addEventListener('DOMContentLoaded', function() {
             .then(res => res.json())
             .then(data => {
                 alert(data.message);
-                if (statusElement) statusElement.textContent = 'Rodando';
-                loadLogsViaAPI();
+                updateBotStatus(data.status);
             })
             .catch(error => {
                 console.error('❌ Erro ao iniciar bot:', error);
@@ -134,8 +316,7 @@ document.addEventListener('DOMContentLoaded', function() {
             .then(res => res.json())
             .then(data => {
                 alert(data.message);
-                if (statusElement) statusElement.textContent = 'Parado';
-                loadLogsViaAPI();
+                updateBotStatus(data.status);
             })
             .catch(error => {
                 console.error('❌ Erro ao parar bot:', error);
@@ -152,16 +333,13 @@ document.addEventListener('DOMContentLoaded', function() {
         }
         
         // Mostra feedback visual
-        logOutput.textContent += '\n🔄 REINICIANDO BOT... Aguarde...\n';
-        scrollToBottom();
+        logView.append('🔄 REINICIANDO BOT... Aguarde...\n');
         
         fetch('/restart_bot', { method: 'POST' })
             .then(res => res.json())
             .then(data => {
                 alert(data.message);
-                if (statusElement) statusElement.textContent = 'Rodando';
-                // Aguarda um pouco antes de recarregar logs
-                setTimeout(loadLogsViaAPI, 3000);
+                updateBotStatus(data.status);
             })
             .catch(error => {
                 console.error('❌ Erro ao reiniciar bot:', error);
@@ -184,7 +362,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 alert(data.message);
                 // O WebSocket vai receber o evento log_cleared e atualizar automaticamente
                 // Mas fazemos fallback também
-                setTimeout(loadLogsViaAPI, 1000);
+                setTimeout(reloadLogsViaAPI, 1000);
             })
             .catch(error => {
                 console.error('❌ Erro ao limpar logs:', error);
@@ -221,6 +399,17 @@ document.addEventListener('DOMContentLoaded', function() {
         })
         .then(res => res.json())
         .then(data => {
+            if (data.errors) {
+                const details = Object.entries(data.errors)
+                    .map(([key, message]) => `• ${key}: ${message}`)
+                    .join('\n');
+                alert(`${data.error}\n\n${details}`);
+                return;
+            }
+            if (data.error) {
+                alert('Erro ao salvar configurações: ' + data.error);
+                return;
+            }
             alert(data.message);
             window.location.reload();
         })
@@ -230,11 +419,73 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     };
     
+    // === HISTÓRICO: segmentos rotacionados (gzip) ===
+    const segmentSelect = document.getElementById('segment-select');
+    const segmentOutput = document.getElementById('segment-output');
+    const segmentMore = document.getElementById('segment-more');
+    let segmentNextOffset = 0;
+    let segmentView = null;
+    
+    async function loadSegments() {
+        if (!segmentSelect) return;
+        try {
+            const response = await fetch('/api/logs/segments');
+            if (!response.ok) return;
+            const data = await response.json();
+            segmentSelect.innerHTML = '';
+            if (!data.segments.length) {
+                segmentSelect.innerHTML = '<option value="">Nenhum segmento</option>';
+                return;
+            }
+            // Mais recentes primeiro
+            data.segments.slice().reverse().forEach(seg => {
+                const option = document.createElement('option');
+                option.value = seg.file;
+                const start = new Date(seg.start * 1000).toLocaleString();
+                const end = new Date(seg.end * 1000).toLocaleString();
+                option.textContent = `${start} → ${end} (${Math.round(seg.bytes / 1024)} KB)`;
+                segmentSelect.appendChild(option);
+            });
+        } catch (error) {
+            console.error('❌ Erro ao listar segmentos:', error);
+        }
+    }
+    
+    async function fetchSegment(offset) {
+        const name = segmentSelect.value;
+        if (!name) return;
+        try {
+            const response = await fetch(`/api/logs/segments/${encodeURIComponent(name)}?offset=${offset}`);
+            const data = await response.json();
+            if (!response.ok) {
+                alert(data.error || response.statusText);
+                return;
+            }
+            segmentOutput.style.display = 'block';
+            // Mesmo visualizador virtualizado do log ao vivo (criado já visível para medir a linha)
+            if (!segmentView) segmentView = createLogView(segmentOutput, false);
+            if (offset === 0) {
+                segmentView.replace(data.logs);
+            } else {
+                segmentView.append(data.logs);
+            }
+            segmentNextOffset = data.next_offset;
+            segmentMore.style.display = data.has_more ? 'inline-block' : 'none';
+        } catch (error) {
+            console.error('❌ Erro ao ler segmento:', error);
+        }
+    }
+    
+    window.openSegment = function() { fetchSegment(0); };
+    window.loadMoreSegment = function() { fetchSegment(segmentNextOffset); };
+    
+    loadSegments();
+    
     // Função para baixar logs
     window.downloadLogs = function() {
         console.log('📥 Baixando logs...');
         
-        const logs = logOutput.textContent;
+        const logs = logView.getText();
         const blob = new Blob([logs], { type: 'text/plain' });
         const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
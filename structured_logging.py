@@ -0,0 +1,172 @@
+# structured_logging.py - Sink opcional em JSON lines e busca indexada por tempo
+import bisect
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from threading import Lock
+
+INDEX_STRIDE_BYTES = 64 * 1024   # Um ponto do índice esparso a cada ~64KB
+HEAD_BYTES = 256                 # Início do arquivo usado para detectar truncamento + reescrita
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+_current_phase = "startup"
+
+
+def set_phase(phase):
+    """Define a fase atual do bot, gravada em cada registro estruturado"""
+    global _current_phase
+    _current_phase = phase
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Um objeto JSON por linha: ts, time, level, logger, phase, msg"""
+
+    def format(self, record):
+        entry = {
+            "ts": record.created,
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "phase": getattr(record, "phase", _current_phase),
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def create_structured_handler(path):
+    """Handler de arquivo em modo append para o sink JSON lines"""
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+# --- Parsers: uma linha -> registro (dict) ou None ---
+def parse_json_line(line):
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) and "ts" in entry else None
+
+
+# "%(asctime)s | %(levelname)s | %(message)s" (bot) ou com "| %(name)s |" (servidor)
+_TEXT_LINE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(\d{3}) \| (?:(\S+) \| )?"
+    r"(DEBUG|INFO|WARNING|ERROR|CRITICAL) \| (.*)$"
+)
+
+
+def parse_text_line(line):
+    match = _TEXT_LINE.match(line.rstrip("\n"))
+    if not match:
+        return None
+    asctime, millis, name, level, msg = match.groups()
+    ts = datetime.strptime(asctime, "%Y-%m-%d %H:%M:%S").timestamp() + int(millis) / 1000
+    return {"ts": ts, "time": f"{asctime}.{millis}", "level": level,
+            "logger": name or "bot-worker", "phase": None, "msg": msg}
+
+
+class LogSearchIndex:
+    """Índice esparso tempo -> offset sobre um arquivo de log só-append.
+
+    A cada INDEX_STRIDE_BYTES guarda (timestamp, offset) da primeira linha
+    com horário. Uma busca com `since` pula direto para o ponto anterior mais
+    próximo em vez de ler o arquivo desde o início. O índice é estendido de
+    forma incremental e descartado se o arquivo for truncado ou trocado.
+    Como a rotação trunca no lugar (mesmo inode) e o arquivo pode voltar a
+    crescer antes da próxima busca, o início do arquivo também é comparado.
+    """
+
+    def __init__(self, path, parser):
+        self.path = str(path)
+        self.parser = parser
+        self._times = []
+        self._offsets = []
+        self._indexed_to = 0
+        self._inode = None
+        self._head = b""
+        self._lock = Lock()
+
+    def refresh(self):
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                self._times, self._offsets, self._indexed_to = [], [], 0
+                self._head = b""
+                return
+
+            with open(self.path, "rb") as f:
+                head = f.read(HEAD_BYTES)
+                if (st.st_ino != self._inode or st.st_size < self._indexed_to or
+                        head[:len(self._head)] != self._head):
+                    self._times, self._offsets, self._indexed_to = [], [], 0
+                    self._inode = st.st_ino
+                self._head = head
+
+                f.seek(self._indexed_to)
+                next_mark = self._offsets[-1] + INDEX_STRIDE_BYTES if self._offsets else 0
+                offset = self._indexed_to
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    if offset >= next_mark:
+                        record = self.parser(raw.decode("utf-8", errors="replace"))
+                        if record is not None:
+                            self._times.append(record["ts"])
+                            self._offsets.append(offset)
+                            next_mark = offset + INDEX_STRIDE_BYTES
+                    offset += len(raw)
+                self._indexed_to = offset
+
+    def start_offset(self, since):
+        """Maior offset indexado cujo horário é anterior a `since`"""
+        if since is None:
+            return 0
+        with self._lock:
+            pos = bisect.bisect_left(self._times, since) - 1
+            return self._offsets[pos] if pos >= 0 else 0
+
+    def search(self, level=None, since=None, until=None, query=None, limit=1000):
+        """Gera registros que passam nos filtros, em ordem do arquivo"""
+        self.refresh()
+        if limit < 1:
+            return
+
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(self.start_offset(since))
+            records = filter_records(f, self.parser, level, since, until, query)
+            for found, record in enumerate(records, 1):
+                yield record
+                if found >= limit:
+                    break
+
+
+def filter_records(lines, parser, level=None, since=None, until=None, query=None):
+    """Registros de `lines` (bytes, em ordem de tempo) que passam nos filtros
+
+    Para de ler ao encontrar um registro posterior a `until`.
+    """
+    min_level = LEVELS.index(level) if level in LEVELS else 0
+    query = query.lower() if query else None
+    for raw in lines:
+        record = parser(raw.decode("utf-8", errors="replace"))
+        if record is None:
+            continue
+        if until is not None and record["ts"] > until:
+            break
+        if since is not None and record["ts"] < since:
+            continue
+        if record["level"] in LEVELS and LEVELS.index(record["level"]) < min_level:
+            continue
+        if query and query not in record["msg"].lower():
+            continue
+        yield record
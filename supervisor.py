@@ -0,0 +1,200 @@
+# supervisor.py - Ciclo de vida do processo do bot fora das requisições HTTP
+import logging
+import subprocess
+import time
+from threading import Lock, Thread
+
+log = logging.getLogger("supervisor")
+
+STOPPED = "stopped"
+STARTING = "starting"
+RUNNING = "running"
+STOPPING = "stopping"
+
+STATE_LABELS = {
+    STOPPED: "Parado",
+    STARTING: "Iniciando",
+    RUNNING: "Rodando",
+    STOPPING: "Parando",
+}
+
+POLL_INTERVAL = 0.5   # Verificação de saída do processo (segundos)
+STOP_TIMEOUT = 10     # Espera após SIGTERM antes do SIGKILL
+
+
+class BotSupervisor:
+    """Dono único do subprocesso do bot.
+
+    start/stop/restart só validam a transição de estado (sob lock) e
+    retornam na hora; o trabalho pesado (rotação de log, SIGTERM -> SIGKILL,
+    espera da saída) roda em uma thread de background. Cada mudança de
+    estado é enviada para on_state_change com o dicionário de status,
+    fora do lock.
+    """
+
+    def __init__(self, command, on_state_change=None, stop_timeout=STOP_TIMEOUT):
+        self.command = command
+        self.on_state_change = on_state_change
+        self.stop_timeout = stop_timeout
+        self.state = STOPPED
+        self.process = None
+        self.started_at = None
+        self.last_exit_code = None
+        self.restart_count = 0
+        self._after_exit = None
+        self._lock = Lock()
+
+    # --- Consulta ---
+    def status(self):
+        with self._lock:
+            return self._status_locked()
+
+    def _status_locked(self):
+        running = self.state == RUNNING and self.started_at
+        return {
+            "state": self.state,
+            "label": STATE_LABELS[self.state],
+            "pid": self.process.pid if self.process else None,
+            "uptime": time.time() - self.started_at if running else 0,
+            "last_exit_code": self.last_exit_code,
+            "restart_count": self.restart_count,
+        }
+
+    def uptime(self):
+        return self.status()["uptime"]
+
+    # --- Controle ---
+    def start(self, before_start=None):
+        """Agenda o início do bot; retorna (aceito, mensagem)"""
+        with self._lock:
+            if self.state != STOPPED:
+                return False, f"Bot já está {STATE_LABELS[self.state].lower()}"
+            status = self._set_state(STARTING)
+        self._notify(status)
+        self._spawn_background(self._start_process, before_start)
+        return True, "Bot iniciando..."
+
+    def stop(self):
+        """Agenda a parada do bot (SIGTERM, depois SIGKILL)"""
+        with self._lock:
+            if self.state != RUNNING:
+                return False, "Bot não estava rodando"
+            status = self._set_state(STOPPING)
+            process = self.process
+        self._notify(status)
+        self._spawn_background(self._terminate, process)
+        return True, "Parando bot..."
+
+    def restart(self, before_start=None):
+        """Para (se necessário) e inicia de novo"""
+        with self._lock:
+            if self.state in (STARTING, STOPPING):
+                return False, f"Bot já está {STATE_LABELS[self.state].lower()}"
+            self.restart_count += 1
+            if self.state == STOPPED:
+                status = self._set_state(STARTING)
+                process = None
+            else:
+                self._after_exit = before_start or (lambda: None)
+                status = self._set_state(STOPPING)
+                process = self.process
+        self._notify(status)
+        if process is None:
+            self._spawn_background(self._start_process, before_start)
+        else:
+            self._spawn_background(self._terminate, process)
+        return True, "Bot reiniciando..."
+
+    # --- Background ---
+    def _spawn_background(self, target, *args):
+        Thread(target=target, args=args, daemon=True).start()
+
+    def _start_process(self, before_start=None):
+        """Inicia e acompanha o bot até parar de vez
+
+        Um restart pedido enquanto o bot roda vira uma nova volta do loop
+        (sem recursão), então a thread não cresce a cada reinício.
+        """
+        try:
+            while True:
+                process = self._spawn(before_start)
+                if process is None:
+                    return
+                before_start = self._watch(process)
+                if before_start is None:
+                    return
+        except Exception as e:
+            log.error(f"❌ Erro inesperado no supervisor: {e}")
+            with self._lock:
+                process, self.process = self.process, None
+                self.started_at = None
+                self._after_exit = None
+                status = self._set_state(STOPPED)
+            if process and process.poll() is None:
+                process.kill()
+            self._notify(status)
+
+    def _spawn(self, before_start):
+        """Retorna o processo iniciado, ou None se falhou (estado volta a STOPPED)"""
+        try:
+            if before_start:
+                before_start()
+            process = subprocess.Popen(self.command)
+        except Exception as e:
+            log.error(f"❌ Erro ao iniciar bot: {e}")
+            with self._lock:
+                status = self._set_state(STOPPED)
+            self._notify(status)
+            return None
+
+        with self._lock:
+            self.process = process
+            self.started_at = time.time()
+            self.last_exit_code = None
+            status = self._set_state(RUNNING)
+        self._notify(status)
+        log.info(f"✅ Bot iniciado com PID: {process.pid}")
+        return process
+
+    def _watch(self, process):
+        """Espera o processo terminar (por parada ou por conta própria)
+
+        Retorna o before_start do restart pendente, ou None se não há restart.
+        """
+        while process.poll() is None:
+            time.sleep(POLL_INTERVAL)
+
+        with self._lock:
+            self.last_exit_code = process.returncode
+            self.process = None
+            self.started_at = None
+            after_exit, self._after_exit = self._after_exit, None
+            status = self._set_state(STARTING if after_exit else STOPPED)
+        self._notify(status)
+        log.info(f"⏹️ Bot finalizado com código {process.returncode}")
+        return after_exit
+
+    def _terminate(self, process):
+        if process.poll() is not None:
+            return
+        log.info(f"⏹️ Enviando SIGTERM para PID {process.pid}")
+        process.terminate()
+        deadline = time.time() + self.stop_timeout
+        while process.poll() is None and time.time() < deadline:
+            time.sleep(POLL_INTERVAL / 5)
+        if process.poll() is None:
+            log.warning(f"⚠️ Bot não respondeu ao SIGTERM em {self.stop_timeout}s, enviando SIGKILL")
+            process.kill()
+
+    def _set_state(self, state):
+        """Chamado com o lock adquirido; retorna o status para _notify"""
+        self.state = state
+        return self._status_locked()
+
+    def _notify(self, status):
+        """Chamado sem o lock: o callback pode fazer I/O (socketio.emit)"""
+        if self.on_state_change:
+            try:
+                self.on_state_change(status)
+            except Exception as e:
+                log.error(f"❌ Erro ao notificar mudança de estado: {e}")